@@ -195,6 +195,31 @@ def connectToPhotoDb():
                                                  photopath text,
                                                  filename text)''')
         photoconn.commit()
+    try:
+        photoc.execute('select * from catalog')
+    except:
+        # Metadata about every exported photo, for use by other tools
+        photoc.execute('''CREATE TABLE catalog (uuid text primary key,
+                                                filename text,
+                                                originalname text,
+                                                imagedate text,
+                                                lastmodified text,
+                                                rating integer,
+                                                haskeywords integer,
+                                                hasadjustments integer,
+                                                timezoneoffset integer,
+                                                masterpath text)''')
+        photoc.execute('CREATE INDEX catalog_imagedate on catalog (imagedate)')
+        photoc.execute('CREATE INDEX catalog_rating on catalog (rating)')
+        photoc.execute('''CREATE TABLE catalog_albums (uuid text,
+                                                       album text,
+                                                       primary key (uuid, album))''')
+        photoc.execute('CREATE INDEX catalog_albums_album on catalog_albums (album)')
+        photoc.execute('''CREATE TABLE catalog_persons (uuid text,
+                                                        person text,
+                                                        primary key (uuid, person))''')
+        photoc.execute('CREATE INDEX catalog_persons_person on catalog_persons (person)')
+        photoconn.commit()
     return()
 
 def checkWhatFilesExists():
@@ -320,6 +345,37 @@ def maybeExport(p,uuid):
         doLog("Validated %s/%s" % (theTargetDirectory, theFilename))
     return(True)
 
+def updateCatalogSet(table, column, uuid, values):
+    global photoc
+    # Only touch the rows that differ from what is already stored
+    photoc.execute("SELECT %s FROM %s WHERE uuid = ?" % (column, table), (uuid,))
+    oldValues = set([row[0] for row in photoc.fetchall()])
+    for v in oldValues - values:
+        photoc.execute("DELETE FROM %s WHERE uuid = ? AND %s = ?" % (table, column), (uuid, v))
+    for v in values - oldValues:
+        photoc.execute("INSERT INTO %s VALUES (?, ?)" % (table), (uuid, v))
+
+def updateCatalog(p, uuid):
+    global photoc
+    photoc.execute("SELECT filename FROM photos WHERE uuid = ?", (uuid,))
+    theFilename = photoc.fetchone()[0]
+    theRow = (uuid,
+              theFilename,
+              p[uuid]['filename'],
+              p[uuid]['imageDate'].strftime("%Y-%m-%d %H:%M:%S"),
+              p[uuid]['lastmodifieddate'].strftime("%Y-%m-%d %H:%M:%S"),
+              p[uuid]['mainRating'],
+              p[uuid]['hasKeywords'],
+              p[uuid]['hasAdjustments'],
+              p[uuid]['imageTimeZoneOffsetSeconds'],
+              p[uuid]['imagePath'])
+    photoc.execute("SELECT * FROM catalog WHERE uuid = ?", (uuid,))
+    if(photoc.fetchone() != theRow):
+        doLog("Updating catalog for %s" % uuid)
+        photoc.execute('INSERT OR REPLACE INTO catalog VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', theRow)
+    updateCatalogSet("catalog_albums", "album", uuid, set(p[uuid]['albumNames']))
+    updateCatalogSet("catalog_persons", "person", uuid, set(p[uuid]['persons']))
+
 def checkWhatFoldersShouldExist():
     global theFolders
     for f in theFolders:
@@ -352,6 +408,7 @@ def checkPhotos():
             maybeExport(p.uuid)
             print("\nSomething is seriously wrong with %s %s" % (p[uuid]['filename'], uuid))
             sys.exit(1)
+        updateCatalog(p, uuid)
         i = i + 1
     photoconn.commit()
     closeStatus()
@@ -370,6 +427,9 @@ def checkPhotos():
                 theFiles[k] = False
     # Remove the info about missing UUIDs
     photoc.execute('DELETE FROM photos WHERE shouldexist = 0')
+    photoc.execute('DELETE FROM catalog WHERE uuid NOT IN (SELECT uuid FROM photos)')
+    photoc.execute('DELETE FROM catalog_albums WHERE uuid NOT IN (SELECT uuid FROM photos)')
+    photoc.execute('DELETE FROM catalog_persons WHERE uuid NOT IN (SELECT uuid FROM photos)')
     photoconn.commit()
     # Now look at the file table for stuff that should not exist
     for f in theFiles:
@@ -456,6 +516,8 @@ def doList(theFile):
         p[uuid]['imageTimeZoneOffsetSeconds'] = row[9]
         p[uuid]['imagePath'] = row[10]
         p[uuid]['albums'] = []
+        p[uuid]['albumNames'] = []
+        p[uuid]['persons'] = []
         doLog("Fetching data for photo %s %s: %s" % (uuid,p[uuid]['filename'], p[uuid]['imageDate']))
 
         # Find what albums the picture is in:
@@ -472,6 +534,7 @@ def doList(theFile):
                         foldername = "%s/%s" % (folderrow[0], foldername)
                         folderUUID = folderrow[1]
                 p[uuid]['albums'].append("Albums/%s" % foldername)
+                p[uuid]['albumNames'].append(foldername)
                 keepFolder("Albums/%s" % foldername)
 
         # Add folder name based on date of photo
@@ -483,6 +546,7 @@ def doList(theFile):
         if(uuid in pf):
             for personName in pf[uuid]:
                 p[uuid]['albums'].append("Persons/%s" % personName)
+                p[uuid]['persons'].append(personName)
                 keepFolder("Persons/%s" % personName)
 
         doLog("To be stored in album(s) %s" % (p[uuid]['albums']))